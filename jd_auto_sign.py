@@ -1,6 +1,13 @@
-import requests
+import json
 import time
+import random
 import logging
+import argparse
+from threading import Condition
+
+from utils.utils.httpclient import HttpClient
+from utils.utils.ratelimit import HostRateLimiter
+from utils.utils.taskpool import TaskPool
 
 # 配置日志
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
@@ -12,19 +19,204 @@ HEADERS = {
     'Referer': 'https://h5.m.jd.com/',
     'Cookie': 'your_jd_cookie'
 }
+# 需要重试的 HTTP 状态码
+RETRY_STATUS = (429, 500, 502, 503, 504)
+
+# 共享的 HTTP 客户端，重试由 jd_sign 带抖动地处理
+http_client = HttpClient(retries=0, pool_maxsize=16)
+
+def jd_sign(cookie=None, name='default', client=None, url=SIGN_URL, retries=3, backoff=0.5, rate_limiter=None):
+    """签到单个账号，失败时按指数退避加随机抖动重试。
+
+    Args:
+        cookie (str): 账号 Cookie，默认使用 HEADERS 中的 Cookie。
+        name (str): 账号名称，仅用于日志与结果。
+        client (HttpClient): HTTP 客户端，默认使用共享客户端。
+        url (str): 签到接口地址。
+        retries (int): 网络异常或服务端错误时的重试次数，默认值为 3。
+        backoff (float): 退避基数（秒），第 n 次重试前等待 [0, backoff * 2^n) 内的随机时间。
+        rate_limiter (HostRateLimiter): 按主机限速器，为 None 时不限速。
+
+    Returns:
+        dict: 签到结果，包含 name、ok、attempts、latencies（每次请求的耗时）、
+            elapsed（含重试退避与限速等待的总耗时）、result、error。
+    """
+    client = client or http_client
+    headers = dict(HEADERS)
+    if cookie is not None:
+        headers['Cookie'] = cookie
+    params = {'appid': 'your_appid'}
+    summary = {'name': name, 'ok': False, 'attempts': 0, 'latencies': [], 'elapsed': None, 'result': None, 'error': None}
+    start = time.perf_counter()
+    for attempt in range(retries + 1):
+        if attempt > 0:
+            time.sleep(random.uniform(0, backoff * 2 ** attempt))
+        if rate_limiter is not None:
+            rate_limiter.acquire(url)
+        summary['attempts'] = attempt + 1
+        request_start = time.perf_counter()
+        try:
+            response = client.get(url, headers=headers, params=params)
+            summary['latencies'].append(time.perf_counter() - request_start)
+            if response.status_code in RETRY_STATUS:
+                summary['error'] = f'HTTP {response.status_code}'
+                continue
+            result = response.json()
+            summary['result'] = result
+            summary['error'] = None
+            if result.get('code') == 0:
+                summary['ok'] = True
+                logging.info('[%s] 京东签到成功，结果：%s', name, result)
+            else:
+                logging.warning('[%s] 京东签到失败，结果：%s', name, result)
+            break
+        except Exception as e:
+            summary['latencies'].append(time.perf_counter() - request_start)
+            summary['error'] = str(e)
+    if summary['error'] is not None:
+        logging.error('[%s] 签到过程中出现异常：%s', name, summary['error'])
+    summary['elapsed'] = time.perf_counter() - start
+    return summary
+
+def load_accounts(path):
+    """读取账号文件。
+
+    支持 JSON 列表 [{"name": ..., "cookie": ...}]，或每行一个 Cookie 的文本文件（# 开头为注释），
+    文本文件中的账号名取 Cookie 中的 pt_pin。
+
+    Args:
+        path (str): 账号文件路径。
+
+    Returns:
+        list: [{"name": str, "cookie": str}, ...]
+    """
+    with open(path, 'r', encoding='utf-8') as f:
+        content = f.read()
+    if path.lower().endswith('.json'):
+        return [{'name': item.get('name') or f'account-{i}', 'cookie': item['cookie']}
+                for i, item in enumerate(json.loads(content), 1)]
+    accounts = []
+    for line in content.splitlines():
+        line = line.strip()
+        if not line or line.startswith('#'):
+            continue
+        name = f'account-{len(accounts) + 1}'
+        for field in line.split(';'):
+            key, _, value = field.strip().partition('=')
+            if key == 'pt_pin' and value:
+                name = value
+        accounts.append({'name': name, 'cookie': line})
+    return accounts
+
+def percentile(values, p):
+    """按最近秩法计算百分位数，values 需已排序。"""
+    if not values:
+        return None
+    rank = max(1, int(-(-p * len(values) // 100)))
+    return values[min(rank, len(values)) - 1]
+
+def latency_stats(values):
+    """计算一组耗时的数量与 p50/p90/p99/max。"""
+    values = sorted(values)
+    return {
+        'count': len(values),
+        'p50': percentile(values, 50),
+        'p90': percentile(values, 90),
+        'p99': percentile(values, 99),
+        'max': values[-1] if values else None,
+    }
+
+def summarize(results, wall_time, total_time=None):
+    """汇总多账号签到结果。
+
+    Args:
+        results (list): jd_sign 返回的结果列表。
+        wall_time (float): 从提交第一个账号到全部签到完成的耗时（秒）。
+        total_time (float): 包含任务池创建与销毁的端到端耗时（秒），默认等于 wall_time。
+
+    Returns:
+        dict: 成功/失败数、耗时、按端到端耗时计算的吞吐量，以及两组延迟统计：
+            request_latency 为所有请求（含失败重试）的单次耗时，
+            account_elapsed 为每个账号含重试退避与限速等待的总耗时。
+    """
+    total_time = wall_time if total_time is None else total_time
+    return {
+        'total': len(results),
+        'ok': sum(1 for r in results if r['ok']),
+        'failed': [r['name'] for r in results if not r['ok']],
+        'wall_time': wall_time,
+        'total_time': total_time,
+        'throughput': len(results) / total_time if total_time else None,
+        'request_latency': latency_stats(latency for r in results for latency in r['latencies']),
+        'account_elapsed': latency_stats(r['elapsed'] for r in results if r['elapsed'] is not None),
+    }
+
+def sign_accounts(accounts, concurrency=4, rate=5, burst=None, retries=3, url=SIGN_URL, client=None, backoff=0.5):
+    """在 TaskPool 线程中并发签到多个账号，共享连接池并按主机限速。
+
+    Args:
+        accounts (list): load_accounts 返回的账号列表。
+        concurrency (int): 并发线程数，默认值为 4。
+        rate (float): 每个主机每秒最多请求数，默认值为 5。
+        burst (float): 每个主机允许的突发请求数，默认等于 rate。
+        retries (int): 单个账号的重试次数，默认值为 3。
+        url (str): 签到接口地址。
+        client (HttpClient): HTTP 客户端，默认按并发数新建一个共享客户端。
+        backoff (float): 重试退避基数（秒），默认值为 0.5。
+
+    Returns:
+        tuple: (按账号顺序排列的结果列表, 汇总信息)
+    """
+    if not accounts:
+        return [], summarize([], 0)
+    own_client = client is None
+    client = client or HttpClient(retries=0, pool_maxsize=concurrency)
+    rate_limiter = HostRateLimiter(rate, burst)
+    results = [None] * len(accounts)
+    done = Condition()
+
+    def sign_one(args):
+        index, account = args
+        try:
+            result = jd_sign(account['cookie'], account['name'], client, url, retries, backoff, rate_limiter)
+        except Exception as e:
+            result = {'name': account['name'], 'ok': False, 'attempts': 0, 'latencies': [],
+                      'elapsed': None, 'result': None, 'error': str(e)}
+        with done:
+            results[index] = result
+            done.notify_all()
 
-def jd_sign():
-    try:
-        params = {'appid': 'your_appid'}
-        response = requests.get(SIGN_URL, headers=HEADERS, params=params)
-        result = response.json()
-        if result.get('code') == 0:
-            logging.info('京东签到成功，结果：%s', result)
-        else:
-            logging.warning('京东签到失败，结果：%s', result)
-    except Exception as e:
-        logging.error('签到过程中出现异常：%s', str(e))
+    total_start = time.perf_counter()
+    pool = TaskPool(concurrency, concurrency + 1, max_queue_cnt=len(accounts), logfile='./logs/taskpool.log')
+    pool.start()
+    start = time.perf_counter()
+    for index, account in enumerate(accounts):
+        pool.addTask(sign_one, (index, account))
+    with done:
+        done.wait_for(lambda: all(r is not None for r in results))
+    wall_time = time.perf_counter() - start
+    pool.stop()
+    pool.join()
+    if own_client:
+        client.close()
+    return results, summarize(results, wall_time, time.perf_counter() - total_start)
 
 if __name__ == '__main__':
-    jd_sign()
-    time.sleep(3)
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="京东自动签到")
+    parser.add_argument('-a', '--accounts', help="账号文件（JSON 或每行一个 Cookie），不指定时使用 HEADERS 中的 Cookie")
+    parser.add_argument('-c', '--concurrency', type=int, default=4, help="并发数")
+    parser.add_argument('-r', '--rate', type=float, default=5, help="每个主机每秒最多请求数")
+    parser.add_argument('--retries', type=int, default=3, help="重试次数")
+    parser.add_argument('--url', default=SIGN_URL, help="签到接口地址")
+    args = parser.parse_args()
+    if args.accounts:
+        results, summary = sign_accounts(load_accounts(args.accounts), args.concurrency, args.rate,
+                                         retries=args.retries, url=args.url)
+        for r in results:
+            elapsed = f"{r['elapsed'] * 1000:.1f}ms" if r['elapsed'] is not None else '-'
+            print(f"{r['name']}: {'成功' if r['ok'] else '失败'}，尝试 {r['attempts']} 次，总耗时 {elapsed}"
+                  + (f"，错误 {r['error']}" if r['error'] else ''))
+        print(json.dumps(summary, ensure_ascii=False, indent=2))
+    else:
+        jd_sign(url=args.url, retries=args.retries)
+        time.sleep(3)
@@ -0,0 +1,95 @@
+import os
+import sys
+
+import pytest
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'tools')))
+
+import jd_auto_sign
+from mock_jd_server import MockJDServer
+
+def make_accounts(count, logged_in=True):
+    """生成测试账号，logged_in 为 False 时 Cookie 中不含 pt_key"""
+    prefix = 'pt_key=key{i}; ' if logged_in else ''
+    return [{'name': f'user{i}', 'cookie': (prefix + 'pt_pin=user{i};').format(i=i)} for i in range(count)]
+
+@pytest.fixture(autouse=True)
+def chdir_tmp(tmp_path, monkeypatch):
+    """TaskPool 的日志写在当前目录下，测试时切换到临时目录"""
+    monkeypatch.chdir(tmp_path)
+
+def test_percentile():
+    values = list(range(1, 101))
+    assert jd_auto_sign.percentile(values, 50) == 50
+    assert jd_auto_sign.percentile(values, 90) == 90
+    assert jd_auto_sign.percentile(values, 99) == 99
+    assert jd_auto_sign.percentile(values, 100) == 100
+    assert jd_auto_sign.percentile([0.3], 99) == 0.3
+    assert jd_auto_sign.percentile([], 50) is None
+
+def test_summarize():
+    results = [
+        {'name': 'a', 'ok': True, 'latencies': [0.1], 'elapsed': 0.1},
+        {'name': 'b', 'ok': False, 'latencies': [0.2, 0.3], 'elapsed': 1.5},
+        {'name': 'c', 'ok': False, 'latencies': [], 'elapsed': None},
+    ]
+    summary = jd_auto_sign.summarize(results, 2.0)
+    assert summary['total'] == 3
+    assert summary['ok'] == 1
+    assert summary['failed'] == ['b', 'c']
+    assert summary['throughput'] == 1.5
+    # 请求延迟包含失败的重试请求
+    assert summary['request_latency'] == {'count': 3, 'p50': 0.2, 'p90': 0.3, 'p99': 0.3, 'max': 0.3}
+    # 账号耗时包含重试退避与限速等待
+    assert summary['account_elapsed'] == {'count': 2, 'p50': 0.1, 'p90': 1.5, 'p99': 1.5, 'max': 1.5}
+    # 吞吐量按端到端耗时计算
+    assert jd_auto_sign.summarize(results, 2.0, 3.0)['throughput'] == 1.0
+
+def test_pool_teardown_included_and_fast():
+    with MockJDServer(latency=0) as server:
+        results, summary = jd_auto_sign.sign_accounts(make_accounts(15), concurrency=8, rate=1000, url=server.url)
+    assert summary['total_time'] >= summary['wall_time']
+    # 任务池的线程并行退出，不再按线程数逐个等待
+    assert summary['total_time'] - summary['wall_time'] < 0.5
+
+def test_rate_limit_per_host():
+    rate = 10
+    with MockJDServer(latency=0) as server:
+        results, summary = jd_auto_sign.sign_accounts(make_accounts(15), concurrency=8, rate=rate, burst=1,
+                                                      url=server.url)
+        arrivals = list(server.arrivals)
+    assert summary['ok'] == 15
+    assert len(arrivals) == 15
+    observed_rate = (len(arrivals) - 1) / (arrivals[-1] - arrivals[0])
+    # 首个请求还要建立连接，到达时间略有抖动，留 5% 余量
+    assert observed_rate <= rate * 1.05
+
+def test_retry_until_success():
+    with MockJDServer(latency=0, fail_first=2) as server:
+        results, summary = jd_auto_sign.sign_accounts(make_accounts(10), concurrency=4, rate=1000, retries=3,
+                                                      url=server.url, backoff=0.01)
+    assert summary['ok'] == 10
+    assert all(r['attempts'] == 3 and r['error'] is None for r in results)
+    assert all(len(r['latencies']) == 3 for r in results)
+    assert summary['request_latency']['count'] == 30
+    assert server.requests == 30
+    assert server.errors == 20
+
+def test_retry_exhausted():
+    retries = 2
+    with MockJDServer(latency=0, error_rate=1.0) as server:
+        results, summary = jd_auto_sign.sign_accounts(make_accounts(3), concurrency=3, rate=1000, retries=retries,
+                                                      url=server.url, backoff=0.01)
+    assert summary['ok'] == 0
+    assert sorted(summary['failed']) == ['user0', 'user1', 'user2']
+    assert all(r['attempts'] == retries + 1 and r['error'] == 'HTTP 503' for r in results)
+    assert server.requests == 3 * (retries + 1)
+
+def test_business_failure_not_retried():
+    with MockJDServer(latency=0) as server:
+        results, summary = jd_auto_sign.sign_accounts(make_accounts(2, logged_in=False), concurrency=2, rate=1000,
+                                                      url=server.url, backoff=0.01)
+    assert summary['ok'] == 0
+    assert all(r['attempts'] == 1 and r['result']['code'] == 3 for r in results)
+    assert server.requests == 2
@@ -0,0 +1,117 @@
+import os
+import sys
+import json
+import datetime
+
+import pytest
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from utils.utils.scheduler import CronExpr, Scheduler
+
+def write_config(path, jobs):
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump({'jobs': jobs}, f)
+
+@pytest.fixture
+def config_file(tmp_path, monkeypatch):
+    """在临时目录下生成任务配置，日志也写在临时目录"""
+    monkeypatch.chdir(tmp_path)
+    path = tmp_path / 'jobs.json'
+    write_config(path, [{'name': 'pid', 'func': 'os:getpid', 'interval': 10}])
+    return str(path)
+
+def test_cron_step_from_start():
+    cron = CronExpr('5/15 * * * *')
+    minutes = [m for m in range(60) if cron.match(datetime.datetime(2026, 10, 19, 8, m))]
+    assert minutes == [5, 20, 35, 50]
+
+def test_cron_dom_dow_or_when_both_restricted():
+    cron = CronExpr('0 0 1 * 1')
+    # 2026-10-19 为周一，2026-10-01 为周四
+    assert cron.match(datetime.datetime(2026, 10, 19))
+    assert cron.match(datetime.datetime(2026, 10, 1))
+    assert not cron.match(datetime.datetime(2026, 10, 2))
+
+def test_cron_dom_dow_and_when_star_step():
+    cron = CronExpr('0 0 */2 * 1')
+    # */2 视为不限定，日与周须同时满足：奇数日且为周一
+    assert cron.match(datetime.datetime(2026, 10, 19))
+    assert not cron.match(datetime.datetime(2026, 10, 26))
+    assert not cron.match(datetime.datetime(2026, 10, 21))
+
+def test_cron_sunday_as_seven():
+    cron = CronExpr('0 0 * * 7')
+    assert cron.match(datetime.datetime(2026, 10, 18))
+    assert not cron.match(datetime.datetime(2026, 10, 19))
+
+@pytest.mark.parametrize('expr', [
+    '* * * *',
+    '60 * * * *',
+    '* 24 * * *',
+    '* * 0 * *',
+    '*/0 * * * *',
+    '5-2 * * * *',
+    'a * * * *',
+])
+def test_cron_rejects_bad_fields(expr):
+    with pytest.raises(ValueError):
+        CronExpr(expr)
+
+def test_job_requires_exactly_one_schedule():
+    with pytest.raises(ValueError):
+        Scheduler.Job('x', 'os:getpid')
+    with pytest.raises(ValueError):
+        Scheduler.Job('x', 'os:getpid', interval=10, cron='* * * * *')
+    with pytest.raises(ValueError):
+        Scheduler.Job('x', 'os:getpid', interval=0)
+
+def test_interval_does_not_replay_missed_runs():
+    job = Scheduler.Job('x', 'os:getpid', interval=10)
+    now = job.next_run + 100
+    assert job.is_due(now)
+    assert job.next_run == now + 10
+    assert not job.is_due(now + 1)
+    assert job.is_due(now + 10)
+
+def test_cron_fires_once_per_minute():
+    job = Scheduler.Job('x', 'os:getpid', cron='* * * * *')
+    now = datetime.datetime(2026, 10, 19, 8, 0, 1).timestamp()
+    assert job.is_due(now)
+    assert not job.is_due(now + 30)
+    assert job.is_due(now + 60)
+
+def test_reload_keeps_stats_and_next_run(config_file):
+    scheduler = Scheduler(config_file, logfile='./logs/scheduler.log')
+    job = scheduler.jobs['pid']
+    job.runs = 3
+    job.failures = 1
+    job.next_run = 12345
+
+    write_config(config_file, [
+        {'name': 'pid', 'func': 'os:getpid', 'interval': 10, 'priority': 3},
+        {'name': 'cwd', 'func': 'os:getcwd', 'interval': 5},
+    ])
+    assert scheduler.reload(force=True)
+    jobs = scheduler.jobs
+    assert jobs['pid'] is not job
+    assert jobs['pid'].priority == 3
+    assert jobs['pid'].runs == 3 and jobs['pid'].failures == 1
+    assert jobs['pid'].next_run == 12345
+    assert jobs['cwd'].runs == 0
+
+    # 修改间隔后重新计算下次执行时间
+    write_config(config_file, [{'name': 'pid', 'func': 'os:getpid', 'interval': 20}])
+    assert scheduler.reload(force=True)
+    assert scheduler.jobs['pid'].runs == 3
+    assert scheduler.jobs['pid'].next_run != 12345
+
+def test_reload_keeps_old_config_on_error(config_file):
+    scheduler = Scheduler(config_file, logfile='./logs/scheduler.log')
+    write_config(config_file, [{'name': 'bad', 'func': 'no_such_module_xyz:run', 'interval': 10}])
+    assert not scheduler.reload(force=True)
+    assert list(scheduler.jobs) == ['pid']
+
+def test_stop_before_start(config_file):
+    scheduler = Scheduler(config_file, logfile='./logs/scheduler.log')
+    scheduler.stop()
@@ -0,0 +1,76 @@
+import os
+import sys
+import stat
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from utils.utils.tokencache import TokenCache
+
+class FakeFetch:
+    """按顺序返回预设结果的令牌获取函数，记录调用参数"""
+    def __init__(self, *results):
+        self.results = list(results)
+        self.calls = []
+
+    def __call__(self, **kwargs):
+        self.calls.append(kwargs)
+        return self.results.pop(0)
+
+def test_cached_until_refresh_margin():
+    fetch = FakeFetch(('tok1', 7200))
+    cache = TokenCache(fetch, refresh_margin=300)
+    assert cache.get() == 'tok1'
+    assert cache.get() == 'tok1'
+    assert len(fetch.calls) == 1
+
+def test_refresh_inside_margin():
+    # 有效期不足 refresh_margin，下一次获取时提前刷新
+    fetch = FakeFetch(('tok1', 200), ('tok2', 7200))
+    cache = TokenCache(fetch, refresh_margin=300)
+    assert cache.get() == 'tok1'
+    assert cache.get() == 'tok2'
+    assert cache.get() == 'tok2'
+    assert len(fetch.calls) == 2
+
+def test_refresh_failure_falls_back_to_unexpired_token():
+    fetch = FakeFetch(('tok1', 200), None)
+    cache = TokenCache(fetch, refresh_margin=300)
+    assert cache.get() == 'tok1'
+    assert cache.get() == 'tok1'
+
+def test_refresh_failure_after_expiry():
+    fetch = FakeFetch(('tok1', 0), None)
+    cache = TokenCache(fetch, refresh_margin=0)
+    assert cache.get() == 'tok1'
+    assert cache.get() is None
+
+def test_forced_refresh_failure_does_not_fall_back():
+    fetch = FakeFetch(('tok1', 7200), None)
+    cache = TokenCache(fetch)
+    assert cache.get() == 'tok1'
+    assert cache.get(force_refresh=True) is None
+
+def test_fetch_kwargs_forwarded():
+    fetch = FakeFetch(('tok1', 7200), ('tok2', 7200))
+    cache = TokenCache(fetch)
+    cache.get(client='a')
+    cache.get(force_refresh=True, client='b')
+    assert fetch.calls == [{'client': 'a'}, {'client': 'b'}]
+
+def test_persist_and_reload(tmp_path):
+    cache_file = tmp_path / 'cache' / 'token.json'
+    fetch = FakeFetch(('tok1', 7200))
+    assert TokenCache(fetch, cache_file=str(cache_file)).get() == 'tok1'
+    assert stat.S_IMODE(os.stat(cache_file).st_mode) == 0o600
+
+    # 新实例从磁盘读取，不再请求
+    fetch2 = FakeFetch()
+    assert TokenCache(fetch2, cache_file=str(cache_file)).get() == 'tok1'
+    assert fetch2.calls == []
+
+def test_corrupt_cache_file_ignored(tmp_path):
+    cache_file = tmp_path / 'token.json'
+    cache_file.write_text('not json')
+    fetch = FakeFetch(('tok1', 7200))
+    assert TokenCache(fetch, cache_file=str(cache_file)).get() == 'tok1'
+    assert len(fetch.calls) == 1
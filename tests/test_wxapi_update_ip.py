@@ -0,0 +1,188 @@
+import os
+import sys
+import json
+import importlib
+from threading import Thread, Lock
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from urllib.parse import urlsplit, parse_qs
+
+import pytest
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'tools')))
+
+from utils.utils.httpclient import HttpClient
+
+# 本地模拟企业微信接口
+class WxapiStub:
+    """模拟 gettoken 与白名单接口，记录收到的请求。"""
+
+    def __init__(self):
+        self.lock = Lock()
+        self.token_calls = []
+        self.whitelist_calls = []
+        # 判定为无效的 access_token
+        self.invalid_tokens = set()
+        # 拒绝添加的 IP
+        self.rejected_ips = set()
+        # 接下来若干个请求返回 503
+        self.fail_next = 0
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+            disable_nagle_algorithm = True
+
+            def do_GET(self):
+                url = urlsplit(self.path)
+                query = {k: v[0] for k, v in parse_qs(url.query).items()}
+                with stub.lock:
+                    if stub.fail_next > 0:
+                        stub.fail_next -= 1
+                        return self.__send(503, {})
+                    stub.token_calls.append(query)
+                    token = f"{query.get('corpid')}-tok{len(stub.token_calls)}"
+                self.__send(200, {'errcode': 0, 'access_token': token, 'expires_in': 7200})
+
+            def do_POST(self):
+                url = urlsplit(self.path)
+                token = parse_qs(url.query).get('access_token', [None])[0]
+                body = json.loads(self.rfile.read(int(self.headers['Content-Length'])))
+                with stub.lock:
+                    stub.whitelist_calls.append((token, body))
+                    if token in stub.invalid_tokens:
+                        errcode = 40014
+                    elif body.get('ip') in stub.rejected_ips:
+                        errcode = 60020
+                    else:
+                        errcode = 0
+                self.__send(200, {'errcode': errcode})
+
+            def __send(self, status, data):
+                body = json.dumps(data).encode('utf-8')
+                self.send_response(status)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        self.httpd = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+        self.httpd.daemon_threads = True
+        self.url = 'http://127.0.0.1:%d' % self.httpd.server_address[1]
+        Thread(target=self.httpd.serve_forever, daemon=True).start()
+
+    def close(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+class FakeDnsCache:
+    """返回预设解析结果的域名解析缓存"""
+    def __init__(self, records):
+        self.records = records
+
+    def resolve_many(self, domains):
+        return {domain: self.records.get(domain) for domain in domains}
+
+@pytest.fixture
+def stub():
+    server = WxapiStub()
+    yield server
+    server.close()
+
+@pytest.fixture
+def client(stub):
+    with HttpClient(base_url=stub.url, backoff_factor=0.01) as http:
+        yield http
+
+@pytest.fixture
+def wxapi(tmp_path, monkeypatch):
+    """导入 wxapi_update_ip，令牌与状态文件写在临时目录"""
+    monkeypatch.chdir(tmp_path)
+    module = importlib.import_module('wxapi_update_ip')
+    monkeypatch.setattr(module, 'TOKEN_CACHE_DIR', str(tmp_path / 'cache'))
+    monkeypatch.setattr(module, 'token_caches', {})
+    monkeypatch.setattr(module, 'dns_cache', FakeDnsCache({'a.example': frozenset({'1.1.1.1'})}))
+    return module
+
+def test_http_client_retries_server_errors(stub, client):
+    stub.fail_next = 2
+    response = client.get('/cgi-bin/gettoken', params={'corpid': 'c'})
+    assert response.json()['errcode'] == 0
+    assert len(stub.token_calls) == 1
+
+def test_http_client_no_retry(stub):
+    stub.fail_next = 1
+    with HttpClient(base_url=stub.url, retries=0) as http:
+        assert http.get('/cgi-bin/gettoken').status_code == 503
+
+def test_http_client_url():
+    http = HttpClient(base_url='http://host/')
+    assert http.url('/path') == 'http://host/path'
+    assert http.url('https://other/x') == 'https://other/x'
+
+def test_access_token_cached(stub, client, wxapi):
+    assert wxapi.get_access_token('c', 's', client) == 'c-tok1'
+    assert wxapi.get_access_token('c', 's', client) == 'c-tok1'
+    assert len(stub.token_calls) == 1
+
+def test_access_token_keyed_by_corp_and_secret(stub, client, wxapi):
+    assert wxapi.get_access_token('c', 's', client) == 'c-tok1'
+    assert wxapi.get_access_token('c', 's2', client) == 'c-tok2'
+    assert wxapi.get_access_token('c2', 's', client) == 'c2-tok3'
+    assert [call['corpsecret'] for call in stub.token_calls] == ['s', 's2', 's']
+
+def test_access_token_uses_client_of_each_call(stub, client, wxapi):
+    assert wxapi.get_access_token('c', 's', client) == 'c-tok1'
+    with HttpClient(base_url='http://127.0.0.1:1', retries=0) as dead:
+        assert wxapi.get_access_token('c', 's', dead, force_refresh=True) is None
+    assert len(stub.token_calls) == 1
+
+def test_access_token_persisted(stub, client, wxapi):
+    assert wxapi.get_access_token('c', 's', client) == 'c-tok1'
+    # 模拟进程重启：清空内存缓存后从磁盘读取
+    wxapi.token_caches.clear()
+    assert wxapi.get_access_token('c', 's', client) == 'c-tok1'
+    assert len(stub.token_calls) == 1
+
+def test_sync_refreshes_invalid_token(stub, client, wxapi):
+    stub.invalid_tokens.add('c-tok1')
+    assert wxapi.sync_ip_whitelist('c', 's', ['a.example'], client=client)
+    assert len(stub.token_calls) == 2
+    assert [token for token, _ in stub.whitelist_calls] == ['c-tok1', 'c-tok2']
+
+def test_sync_pushes_only_on_change(stub, client, wxapi):
+    assert wxapi.sync_ip_whitelist('c', 's', ['a.example'], client=client)
+    assert not wxapi.sync_ip_whitelist('c', 's', ['a.example'], client=client)
+    assert len(stub.whitelist_calls) == 1
+    wxapi.dns_cache.records['a.example'] = frozenset({'1.1.1.1', '2.2.2.2'})
+    assert wxapi.sync_ip_whitelist('c', 's', ['a.example'], client=client)
+    assert [body for _, body in stub.whitelist_calls] == [{'ip': '1.1.1.1'}, {'ip': '2.2.2.2'}]
+
+def test_sync_state_kept_per_corp(stub, client, wxapi):
+    # 两个企业解析到相同 IP，各自都要推送
+    assert wxapi.sync_ip_whitelist('c', 's', ['a.example'], client=client)
+    assert wxapi.sync_ip_whitelist('c2', 's2', ['a.example'], client=client)
+    assert [token for token, _ in stub.whitelist_calls] == ['c-tok1', 'c2-tok2']
+    assert not wxapi.sync_ip_whitelist('c2', 's2', ['a.example'], client=client)
+
+def test_sync_skips_empty_and_failed_resolution(stub, client, wxapi):
+    assert not wxapi.sync_ip_whitelist('c', 's', [], client=client)
+    assert not wxapi.sync_ip_whitelist('c', 's', ['a.example', 'missing.example'], client=client)
+    assert stub.whitelist_calls == []
+
+def test_sync_pushes_one_request_per_ip(stub, client, wxapi):
+    wxapi.dns_cache.records['b.example'] = frozenset({'3.3.3.3', '2.2.2.2'})
+    assert wxapi.sync_ip_whitelist('c', 's', ['a.example', 'b.example'], client=client)
+    assert [body for _, body in stub.whitelist_calls] == [{'ip': '1.1.1.1'}, {'ip': '2.2.2.2'}, {'ip': '3.3.3.3'}]
+
+def test_sync_not_persisted_on_partial_failure(stub, client, wxapi):
+    wxapi.dns_cache.records['b.example'] = frozenset({'2.2.2.2'})
+    stub.rejected_ips.add('2.2.2.2')
+    assert not wxapi.sync_ip_whitelist('c', 's', ['a.example', 'b.example'], client=client)
+    # 未全部成功，不记录已推送集合，下次重新推送
+    stub.rejected_ips.clear()
+    assert wxapi.sync_ip_whitelist('c', 's', ['a.example', 'b.example'], client=client)
+    assert [body['ip'] for _, body in stub.whitelist_calls] == ['1.1.1.1', '2.2.2.2', '1.1.1.1', '2.2.2.2']
@@ -0,0 +1,139 @@
+import os
+import sys
+import json
+import time
+import random
+import argparse
+from threading import Thread, Lock
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+script_directory = os.path.dirname(os.path.abspath(__file__))
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+# 本地模拟京东签到接口，用于测试与压测
+class MockJDServer:
+    """在后台线程运行的模拟签到服务器。"""
+
+    def __init__(self, host:str='127.0.0.1', port:int=0, latency:float=0.05, error_rate:float=0.0, fail_first:int=0):
+        """初始化模拟服务器。
+
+        Args:
+            host (str): 监听地址，默认值为 '127.0.0.1'。
+            port (int): 监听端口，为 0 时自动分配。
+            latency (float): 每个请求的模拟处理耗时（秒），默认值为 0.05。
+            error_rate (float): 返回 503 的概率，用于验证重试，默认值为 0。
+            fail_first (int): 每个 Cookie 的前若干次请求固定返回 503，用于确定性地验证重试，默认值为 0。
+        """
+        self.latency = latency
+        self.error_rate = error_rate
+        self.fail_first = fail_first
+        # 每个 Cookie 的请求次数
+        self.cookie_requests = {}
+        self.lock = Lock()
+        self.requests = 0
+        self.errors = 0
+        # 每个请求的到达时间，用于检查限速效果
+        self.arrivals = []
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+            # 响应头与响应体分两次写出，开启 Nagle 算法时会被客户端的延迟 ACK 卡住约 40ms
+            disable_nagle_algorithm = True
+
+            def do_GET(self):
+                with server.lock:
+                    server.requests += 1
+                    server.arrivals.append(time.monotonic())
+                    cookie = self.headers.get('Cookie', '')
+                    server.cookie_requests[cookie] = server.cookie_requests.get(cookie, 0) + 1
+                    fail = (server.cookie_requests[cookie] <= server.fail_first
+                            or random.random() < server.error_rate)
+                    if fail:
+                        server.errors += 1
+                time.sleep(server.latency)
+                if fail:
+                    self.__send(503, {'code': -1, 'msg': 'service unavailable'})
+                elif 'pt_key=' in self.headers.get('Cookie', ''):
+                    self.__send(200, {'code': 0, 'data': {'status': 1, 'dailyAward': {'beanAward': {'beanCount': 5}}}})
+                else:
+                    self.__send(200, {'code': 3, 'errorMessage': 'not login'})
+
+            def __send(self, status, data):
+                body = json.dumps(data).encode('utf-8')
+                self.send_response(status)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        self.__httpd = ThreadingHTTPServer((host, port), Handler)
+        self.__httpd.daemon_threads = True
+        self.__thread = None
+
+    @property
+    def url(self):
+        """返回模拟签到接口的地址"""
+        host, port = self.__httpd.server_address[:2]
+        return f"http://{host}:{port}/client.action?functionId=signBeanAct"
+
+    def start(self):
+        """在后台线程中启动服务器"""
+        self.__thread = Thread(name='mock-jd-server', target=self.__httpd.serve_forever, daemon=True)
+        self.__thread.start()
+        return self
+
+    def stop(self):
+        """停止服务器"""
+        self.__httpd.shutdown()
+        self.__httpd.server_close()
+        if self.__thread is not None:
+            self.__thread.join()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.stop()
+
+def benchmark(accounts:int=50, concurrency:int=8, rate:float=20, latency:float=0.05, error_rate:float=0.1):
+    """启动模拟服务器并压测多账号签到，打印汇总结果。"""
+    import jd_auto_sign
+
+    fake_accounts = [{'name': f'user{i}', 'cookie': f'pt_key=key{i}; pt_pin=user{i};'} for i in range(accounts)]
+    with MockJDServer(latency=latency, error_rate=error_rate) as server:
+        results, summary = jd_auto_sign.sign_accounts(fake_accounts, concurrency, rate, url=server.url)
+        arrivals = server.arrivals
+        observed_rate = (len(arrivals) - 1) / (arrivals[-1] - arrivals[0]) if len(arrivals) > 1 else None
+    summary['requests'] = server.requests
+    summary['injected_errors'] = server.errors
+    summary['observed_rate'] = observed_rate
+    print(json.dumps(summary, ensure_ascii=False, indent=2))
+    return summary
+
+# 主程序入口
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="模拟京东签到接口")
+    parser.add_argument('--port', type=int, default=8000, help="监听端口，仅 --serve 时使用")
+    parser.add_argument('--serve', action='store_true', help="只运行模拟服务器，不执行压测")
+    parser.add_argument('--accounts', type=int, default=50, help="压测账号数")
+    parser.add_argument('--concurrency', type=int, default=8, help="压测并发数")
+    parser.add_argument('--rate', type=float, default=20, help="每秒最多请求数")
+    parser.add_argument('--latency', type=float, default=0.05, help="模拟处理耗时（秒）")
+    parser.add_argument('--error-rate', type=float, default=0.1, help="返回 503 的概率")
+    args = parser.parse_args()
+    if args.serve:
+        server = MockJDServer(port=args.port, latency=args.latency, error_rate=args.error_rate)
+        print(f"模拟签到接口: {server.url}")
+        server.start()
+        try:
+            while True:
+                time.sleep(1)
+        except KeyboardInterrupt:
+            server.stop()
+    else:
+        benchmark(args.accounts, args.concurrency, args.rate, args.latency, args.error_rate)
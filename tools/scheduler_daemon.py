@@ -0,0 +1,42 @@
+import os
+import sys
+import signal
+import argparse
+from threading import Event
+
+script_directory = os.path.dirname(os.path.abspath(__file__))
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from utils.utils.scheduler import Scheduler
+
+def main():
+    """常驻运行调度器，代替 cron 逐次启动脚本。
+
+    任务在同一进程内执行，模块级的会话与日志只初始化一次；
+    修改配置文件后自动热加载，发送 SIGHUP 可立即重新加载。
+    """
+    parser = argparse.ArgumentParser(description="常驻任务调度器")
+    parser.add_argument('-c', '--config', default=os.path.join(script_directory, 'scheduler_jobs.json'),
+                        help="任务配置文件路径")
+    parser.add_argument('--pool-size', type=int, default=2, help="任务池线程数")
+    parser.add_argument('--logfile', default='./logs/scheduler.log', help="日志文件路径")
+    args = parser.parse_args()
+
+    stop_event = Event()
+    scheduler = Scheduler(args.config, pool_size=args.pool_size, logfile=args.logfile)
+
+    signal.signal(signal.SIGINT, lambda signum, frame: stop_event.set())
+    signal.signal(signal.SIGTERM, lambda signum, frame: stop_event.set())
+    if hasattr(signal, 'SIGHUP'):
+        signal.signal(signal.SIGHUP, lambda signum, frame: scheduler.reload(force=True))
+
+    scheduler.start()
+    while not stop_event.is_set() and scheduler.is_alive():
+        stop_event.wait(1)
+    scheduler.stop()
+    scheduler.join()
+
+# 主程序入口
+if __name__ == "__main__":
+    main()
@@ -1,60 +1,128 @@
-import socket
 import os
 import sys
-import requests
+import json
+import hashlib
+import time
+import argparse
 
 script_directory = os.path.dirname(os.path.abspath(__file__))
 
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
 from utils.utils import logger
+from utils.utils.httpclient import HttpClient
+from utils.utils.tokencache import TokenCache
+from utils.utils.dnscache import DnsCache
 
 # 创建 Logger 实例
 app_logger = logger.Logger(name='LOG', log_file="./logs/wxapi_update_ip.log")
 
+# 企业微信接口地址，可通过环境变量指向本地桩服务器进行测试
+WXAPI_BASE_URL = os.environ.get('WXAPI_BASE_URL', 'https://qyapi.weixin.qq.com')
+# access_token 与已推送 IP 的缓存目录
+TOKEN_CACHE_DIR = os.environ.get('WXAPI_TOKEN_CACHE_DIR', './cache')
+# access_token 无效或过期的错误码
+TOKEN_INVALID_ERRCODES = (40014, 42001)
+
+# 共享的 HTTP 客户端，白名单更新为幂等操作，允许 POST 重试
+http_client = HttpClient(base_url=WXAPI_BASE_URL, retry_methods=None)
+# 按 (corp_id, corp_secret) 缓存的 TokenCache 实例
+token_caches = {}
+# 共享的域名解析缓存
+dns_cache = DnsCache(logger=app_logger)
+
+CORP_ID = "wwe0abb1a9ad011a1c"
+CORP_SECRET = "ECQ0usPbucEHICmWI2okqwOpZnyQvsHlYVrCwy20Tx4"
+DOMAINS = ["device.nginx.littlehai.top"]
+
 def get_ip_from_domain(domain):
-    try:
-        ip = socket.gethostbyname(domain)
+    ips = dns_cache.resolve(domain)
+    if ips:
+        ip = sorted(ips)[0]
         app_logger.info(f"获取 ip 成功: {ip}")
         return ip
+    return None
+
+# 从接口获取新的企业微信 access_token
+def fetch_access_token(corp_id, corp_secret, client=None):
+    """请求企业微信接口获取新的 access_token。
+
+    Args:
+        corp_id (str): 企业 ID。
+        corp_secret (str): 应用的凭证密钥。
+        client (HttpClient): HTTP 客户端，默认使用共享客户端。
+
+    Returns:
+        tuple or None: (access_token, expires_in)，失败返回 None。
+    """
+    client = client or http_client
+    try:
+        response = client.get("/cgi-bin/gettoken", params={"corpid": corp_id, "corpsecret": corp_secret})
+        data = response.json()
     except Exception as e:
-        app_logger.info(f"无法解析域名 {domain}: {e}")
+        app_logger.info(f"获取 access_token 失败: {e}")
         return None
-    
-# 获取企业微信 access_token
-def get_access_token(corp_id, corp_secret):
-    url = f"https://qyapi.weixin.qq.com/cgi-bin/gettoken?corpid={corp_id}&corpsecret={corp_secret}"
-    response = requests.get(url)
-    data = response.json()
     if data.get("errcode") == 0:
-        app_logger.info(f"获取 access_token 成功: {data}")
-        return data["access_token"]
+        app_logger.info(f"获取 access_token 成功，有效期 {data.get('expires_in')}s")
+        return data["access_token"], data.get("expires_in", 7200)
     else:
         app_logger.info(f"获取 access_token 失败: {data}")
         return None
 
-def update_ip_whitelist(access_token, ip):
-    url = f"https://qyapi.weixin.qq.com/cgi-bin/whatever-whitelist-api"
+def cache_file_name(prefix, corp_id, corp_secret):
+    """返回 (corp_id, corp_secret) 对应的缓存文件路径。
+
+    同一企业的不同应用各有 access_token 与白名单，文件名附带密钥摘要加以区分。
+    """
+    secret_digest = hashlib.sha1(corp_secret.encode('utf-8')).hexdigest()[:8]
+    return os.path.join(TOKEN_CACHE_DIR, f"{prefix}_{corp_id}_{secret_digest}.json")
+
+def get_token_cache(corp_id, corp_secret):
+    """返回 (corp_id, corp_secret) 对应的 TokenCache，首次调用时创建并从磁盘加载。"""
+    key = (corp_id, corp_secret)
+    if key not in token_caches:
+        token_caches[key] = TokenCache(
+            lambda client=None: fetch_access_token(corp_id, corp_secret, client),
+            cache_file=cache_file_name('wxapi_token', corp_id, corp_secret),
+            logger=app_logger,
+        )
+    return token_caches[key]
+
+# 获取企业微信 access_token，优先使用缓存
+def get_access_token(corp_id, corp_secret, client=None, force_refresh=False):
+    return get_token_cache(corp_id, corp_secret).get(force_refresh, client=client)
+
+def update_ip_whitelist(access_token, ip, client=None):
+    """更新 IP 白名单。
+
+    Args:
+        access_token (str): 企业微信 access_token。
+        ip (str): 要添加的 IP 地址。
+        client (HttpClient): HTTP 客户端，默认使用共享客户端。
+
+    Returns:
+        dict or None: 接口返回结果，请求或解析失败返回 None。
+    """
+    client = client or http_client
     data = {
         "ip": ip,
         # 根据 API 文档，可能需要传入其他参数
     }
-    response = requests.post(url, params={"access_token": access_token}, json=data)
     try:
+        response = client.post("/cgi-bin/whatever-whitelist-api", params={"access_token": access_token}, json=data)
         app_logger.info(response)
         result = response.json()
         if result.get("errcode") == 0:
             app_logger.info(f"成功添加 IP 地址 {ip} 到白名单")
         else:
             app_logger.info(f"更新白名单失败: {result}")
+        return result
     except Exception as e:
         app_logger.info(f"解析 API 响应失败: {e}")
+        return None
 
 # 在此添加文件级注释，描述文件的主要功能和用途
 
-# 导入必要的模块
-import requests
-
 # 定义函数，添加函数级注释
 def update_wxapi_ip(ip_address):
     """更新微信 API 的 IP 地址。
@@ -69,23 +137,109 @@ def update_wxapi_ip(ip_address):
     payload = {
         "ip": ip_address
     }
-    response = requests.post(url, json=payload)
+    response = http_client.post(url, json=payload)
     return response.json()
 
+def load_pushed_ips(state_file):
+    """读取上次成功推送的 IP 集合，文件不存在时返回 None。"""
+    try:
+        with open(state_file, 'r', encoding='utf-8') as f:
+            return frozenset(json.load(f).get("ips", []))
+    except FileNotFoundError:
+        return None
+    except Exception as e:
+        app_logger.info(f"读取已推送 IP 失败: {e}")
+        return None
+
+def save_pushed_ips(ips, state_file):
+    """持久化成功推送的 IP 集合。"""
+    state_file = os.path.abspath(state_file)
+    os.makedirs(os.path.dirname(state_file), exist_ok=True)
+    tmp_file = f"{state_file}.tmp"
+    with open(tmp_file, 'w', encoding='utf-8') as f:
+        json.dump({"ips": sorted(ips), "updated_at": time.time()}, f)
+    os.replace(tmp_file, state_file)
+
+def sync_ip_whitelist(corp_id, corp_secret, domains, state_file=None, force=False, client=None):
+    """解析域名，仅在 IP 集合变化时批量更新白名单。
+
+    Args:
+        corp_id (str): 企业 ID。
+        corp_secret (str): 应用的凭证密钥。
+        domains (list): 要解析的域名，多个域名并发解析。
+        state_file (str): 已推送 IP 的持久化文件，默认按 (corp_id, corp_secret) 存放在 TOKEN_CACHE_DIR 下。
+        force (bool): 为 True 时忽略上次推送结果强制更新。
+        client (HttpClient): HTTP 客户端，默认使用共享客户端。
+
+    Returns:
+        bool: 本次调用了白名单接口并更新成功返回 True。
+
+    每个新增 IP 单独调用一次白名单接口，全部成功后才记录本次的 IP 集合，
+    部分失败时下次会重新推送。
+    """
+    state_file = state_file or cache_file_name('wxapi_pushed_ips', corp_id, corp_secret)
+    resolved = dns_cache.resolve_many(domains)
+    failed = [domain for domain, ips in resolved.items() if not ips]
+    if failed:
+        # 部分域名解析失败时不更新，避免把仍在使用的 IP 移出白名单
+        app_logger.info(f"域名解析失败，跳过本次更新: {failed}")
+        return False
+    ips = frozenset().union(*resolved.values())
+    if not ips:
+        # 没有任何 IP 时不更新，避免清空白名单
+        app_logger.info(f"未解析到任何 IP，跳过本次更新: {domains}")
+        return False
+    pushed = load_pushed_ips(state_file)
+    if not force and ips == pushed:
+        app_logger.debug(f"IP 未变化，无需更新: {sorted(ips)}")
+        return False
+    # 白名单接口为添加操作，已推送过的 IP 无需重复推送
+    new_ips = ips if force or pushed is None else ips - pushed
+    app_logger.info(f"IP 发生变化，准备更新白名单: {sorted(ips)}，新增: {sorted(new_ips)}")
+    access_token = get_access_token(corp_id, corp_secret, client)
+    if not access_token:
+        return False
+    for ip in sorted(new_ips):
+        result = update_ip_whitelist(access_token, ip, client)
+        # access_token 失效时强制刷新后重试一次
+        if result and result.get("errcode") in TOKEN_INVALID_ERRCODES:
+            access_token = get_access_token(corp_id, corp_secret, client, force_refresh=True)
+            if not access_token:
+                return False
+            result = update_ip_whitelist(access_token, ip, client)
+        if not result or result.get("errcode") != 0:
+            return False
+    save_pushed_ips(ips, state_file)
+    return True
+
+def watch(corp_id, corp_secret, domains, interval=60, state_file=None):
+    """常驻监视域名解析结果，IP 变化时更新白名单。
+
+    Args:
+        interval (float): 检查间隔（秒），默认值为 60；域名 TTL 未过期时不会重复解析。
+    """
+    app_logger.info(f"开始监视域名 {domains}，间隔 {interval}s")
+    while True:
+        try:
+            sync_ip_whitelist(corp_id, corp_secret, domains, state_file)
+        except Exception as e:
+            app_logger.error(f"同步白名单出错: {e}")
+        time.sleep(interval)
+
+def main(domains=None, force=False):
+    """检查域名解析出的 IP，发生变化时更新到白名单，可作为调度器任务执行。"""
+    sync_ip_whitelist(CORP_ID, CORP_SECRET, domains or DOMAINS, force=force)
+
 # 主程序入口，添加注释
 if __name__ == "__main__":
     """主程序入口，用于测试更新微信 API IP 地址的功能。"""
-    new_ip = "192.168.1.1"
-    result = update_wxapi_ip(new_ip)
-    print(result)
-    corp_id = "wwe0abb1a9ad011a1c"
-    corp_secret = "ECQ0usPbucEHICmWI2okqwOpZnyQvsHlYVrCwy20Tx4"
-    domain = "device.nginx.littlehai.top"
-    # 获取企业微信 access_token
-    access_token = get_access_token(corp_id, corp_secret)
-    if access_token:
-        # 获取 IP 地址
-        ip = get_ip_from_domain(domain)
-        if ip:
-            # 更新 IP 白名单
-            update_ip_whitelist(access_token, ip)
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="将域名解析出的 IP 更新到企业微信白名单")
+    parser.add_argument('-d', '--domain', action='append', help="要解析的域名，可重复指定")
+    parser.add_argument('-w', '--watch', action='store_true', help="常驻监视，IP 变化时才更新")
+    parser.add_argument('-i', '--interval', type=float, default=60, help="监视模式的检查间隔（秒）")
+    parser.add_argument('-f', '--force', action='store_true', help="忽略上次推送结果强制更新")
+    args = parser.parse_args()
+    if args.watch:
+        watch(CORP_ID, CORP_SECRET, args.domain or DOMAINS, args.interval)
+    else:
+        main(args.domain, args.force)
\ No newline at end of file
@@ -0,0 +1,90 @@
+# 导入必要的模块
+import time
+import socket
+from threading import RLock
+from concurrent.futures import ThreadPoolExecutor
+
+# dnspython 为可选依赖，安装后可按记录的 TTL 缓存
+try:
+    import dns.resolver
+except ImportError:
+    dns = None
+
+# 按 TTL 缓存的域名解析器
+class DnsCache:
+    """解析域名的全部 IPv4 地址，并在 TTL 内复用解析结果。"""
+
+    def __init__(self, default_ttl:float=60, min_ttl:float=5, logger=None):
+        """初始化解析缓存。
+
+        Args:
+            default_ttl (float): 无法获取记录 TTL 时使用的缓存时间（秒），默认值为 60。
+            min_ttl (float): 缓存时间下限（秒），避免 TTL 过小时频繁解析，默认值为 5。
+            logger: 日志记录器，为 None 时不记录日志。
+        """
+        self.__default_ttl = default_ttl
+        self.__min_ttl = min_ttl
+        self.__logger = logger
+        self.__rlock = RLock()
+        # 域名 -> (IP 集合, 过期时间)
+        self.__cache = {}
+
+    def __log(self, msg):
+        if self.__logger is not None:
+            self.__logger.info(msg)
+
+    def __query(self, domain):
+        """实际查询 DNS，返回 (IP 集合, TTL)。"""
+        if dns is not None:
+            answer = dns.resolver.resolve(domain, 'A')
+            return {record.address for record in answer}, answer.rrset.ttl
+        infos = socket.getaddrinfo(domain, None, socket.AF_INET, socket.SOCK_STREAM)
+        return {info[4][0] for info in infos}, self.__default_ttl
+
+    def resolve(self, domain:str):
+        """解析域名，缓存未过期时直接返回缓存结果。
+
+        解析失败时返回过期的旧结果（如有）。
+
+        Args:
+            domain (str): 要解析的域名。
+
+        Returns:
+            frozenset or None: IP 地址集合，解析失败且无旧结果时返回 None。
+        """
+        now = time.time()
+        with self.__rlock:
+            cached = self.__cache.get(domain)
+        if cached is not None and now < cached[1]:
+            return cached[0]
+        try:
+            ips, ttl = self.__query(domain)
+        except Exception as e:
+            self.__log(f"无法解析域名 {domain}: {e}")
+            return cached[0] if cached is not None else None
+        ips = frozenset(ips)
+        with self.__rlock:
+            self.__cache[domain] = (ips, now + max(ttl, self.__min_ttl))
+        self.__log(f"解析域名 {domain} 成功: {sorted(ips)}，TTL {ttl}s")
+        return ips
+
+    def resolve_many(self, domains, max_workers:int=8):
+        """并发解析多个域名。
+
+        Args:
+            domains (iterable): 要解析的域名。
+            max_workers (int): 最大并发数，默认值为 8。
+
+        Returns:
+            dict: 域名到 IP 集合（或 None）的映射。
+        """
+        domains = list(dict.fromkeys(domains))
+        if len(domains) <= 1:
+            return {domain: self.resolve(domain) for domain in domains}
+        with ThreadPoolExecutor(max_workers=min(max_workers, len(domains))) as executor:
+            return dict(zip(domains, executor.map(self.resolve, domains)))
+
+    def clear(self):
+        """清空缓存"""
+        with self.__rlock:
+            self.__cache.clear()
@@ -0,0 +1,86 @@
+# 导入必要的模块
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+# 基于连接池的 HTTP 客户端，复用 TCP/TLS 连接
+class HttpClient:
+    """带连接池、超时与退避重试的 HTTP 客户端。"""
+
+    def __init__(self, base_url:str='', timeout=(3.05, 10), retries:int=3, backoff_factor:float=0.5,
+                 status_forcelist=(429, 500, 502, 503, 504), retry_methods=Retry.DEFAULT_ALLOWED_METHODS,
+                 pool_connections:int=4, pool_maxsize:int=10, headers:dict=None):
+        """初始化 HTTP 客户端。
+
+        Args:
+            base_url (str): 相对路径请求的基础地址，例如 'https://qyapi.weixin.qq.com'。
+            timeout (float or tuple): 默认超时（秒），可为 (连接超时, 读取超时)。
+            retries (int): 失败重试次数，默认值为 3，为 0 时不重试。
+            backoff_factor (float): 重试退避系数，第 n 次重试前等待 backoff_factor * 2^(n-1) 秒。
+            status_forcelist (tuple): 需要重试的 HTTP 状态码。
+            retry_methods (iterable): 允许重试的请求方法，默认不重试 POST 等非幂等方法。
+            pool_connections (int): 连接池缓存的主机数量，默认值为 4。
+            pool_maxsize (int): 每个主机的最大连接数，默认值为 10。
+            headers (dict): 每个请求都会携带的请求头。
+        """
+        self.base_url = base_url.rstrip('/')
+        self.timeout = timeout
+        retry = Retry(
+            total=retries,
+            connect=retries,
+            read=retries,
+            status=retries,
+            backoff_factor=backoff_factor,
+            status_forcelist=status_forcelist,
+            allowed_methods=retry_methods,
+            raise_on_status=False,
+        )
+        adapter = HTTPAdapter(pool_connections=pool_connections, pool_maxsize=pool_maxsize, max_retries=retry)
+        self.__session = requests.Session()
+        self.__session.mount('http://', adapter)
+        self.__session.mount('https://', adapter)
+        if headers:
+            self.__session.headers.update(headers)
+
+    @property
+    def session(self):
+        """返回底层的 requests.Session 实例"""
+        return self.__session
+
+    def url(self, path:str):
+        """将相对路径拼接为完整地址，完整地址原样返回。"""
+        if path.startswith(('http://', 'https://')) or not self.base_url:
+            return path
+        return f"{self.base_url}/{path.lstrip('/')}"
+
+    def request(self, method:str, path:str, **kwargs):
+        """发送请求，未指定 timeout 时使用默认超时。
+
+        Args:
+            method (str): 请求方法。
+            path (str): 请求路径或完整地址。
+            **kwargs: 透传给 requests.Session.request 的参数。
+
+        Returns:
+            requests.Response: 响应对象。
+        """
+        kwargs.setdefault('timeout', self.timeout)
+        return self.__session.request(method, self.url(path), **kwargs)
+
+    def get(self, path:str, **kwargs):
+        """发送 GET 请求"""
+        return self.request('GET', path, **kwargs)
+
+    def post(self, path:str, **kwargs):
+        """发送 POST 请求"""
+        return self.request('POST', path, **kwargs)
+
+    def close(self):
+        """关闭会话并释放连接池"""
+        self.__session.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
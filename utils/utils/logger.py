@@ -12,6 +12,12 @@ class Logger:
         """
         self.__logger = logging.getLogger(name)
         self.__logger.setLevel(level)
+        # 已有自己的处理器，不再向根记录器传递，避免根记录器被 basicConfig 配置后重复输出
+        self.__logger.propagate = False
+
+        # 同名日志记录器已添加过处理器时直接复用，避免重复创建实例导致日志重复输出
+        if self.__logger.handlers:
+            return
 
         log_file_fullpath = os.path.abspath(log_file)
         if not os.path.exists(os.path.dirname(log_file_fullpath)):
@@ -0,0 +1,88 @@
+# 导入必要的模块
+import time
+from threading import Lock
+from urllib.parse import urlsplit
+
+# 令牌桶限速器
+class TokenBucket:
+    """线程安全的令牌桶，按固定速率补充令牌，允许一定突发。"""
+
+    def __init__(self, rate:float, capacity:float=None):
+        """初始化令牌桶。
+
+        Args:
+            rate (float): 每秒补充的令牌数，必须 > 0。
+            capacity (float): 桶容量，即允许的最大突发数，默认等于 rate（至少为 1）。
+        """
+        if rate <= 0:
+            raise ValueError("rate must > 0")
+        self.rate = rate
+        self.capacity = capacity if capacity is not None else max(1, rate)
+        self.__tokens = self.capacity
+        self.__last = time.monotonic()
+        self.__lock = Lock()
+
+    def __refill(self, now):
+        self.__tokens = min(self.capacity, self.__tokens + (now - self.__last) * self.rate)
+        self.__last = now
+
+    def try_acquire(self, tokens:float=1):
+        """尝试取出令牌，不阻塞。
+
+        Returns:
+            float: 取出成功返回 0，否则返回还需等待的秒数。
+        """
+        with self.__lock:
+            self.__refill(time.monotonic())
+            if self.__tokens >= tokens:
+                self.__tokens -= tokens
+                return 0
+            return (tokens - self.__tokens) / self.rate
+
+    def acquire(self, tokens:float=1):
+        """取出令牌，令牌不足时阻塞等待。
+
+        Returns:
+            float: 实际等待的秒数。
+        """
+        waited = 0
+        while True:
+            wait = self.try_acquire(tokens)
+            if wait == 0:
+                return waited
+            time.sleep(wait)
+            waited += wait
+
+# 按主机区分的限速器
+class HostRateLimiter:
+    """为每个主机维护一个独立的令牌桶。"""
+
+    def __init__(self, rate:float, capacity:float=None, overrides:dict=None):
+        """初始化按主机限速器。
+
+        Args:
+            rate (float): 每个主机默认的每秒请求数。
+            capacity (float): 每个主机默认的突发数。
+            overrides (dict): 主机名到 (rate, capacity) 的映射，用于单独设置某些主机。
+        """
+        self.rate = rate
+        self.capacity = capacity
+        self.__overrides = overrides or {}
+        self.__buckets = {}
+        self.__lock = Lock()
+
+    def bucket(self, host:str):
+        """返回主机对应的令牌桶，首次访问时创建。"""
+        with self.__lock:
+            if host not in self.__buckets:
+                rate, capacity = self.__overrides.get(host, (self.rate, self.capacity))
+                self.__buckets[host] = TokenBucket(rate, capacity)
+            return self.__buckets[host]
+
+    def acquire(self, url:str):
+        """按 URL 的主机名取出令牌，阻塞直到允许请求。
+
+        Returns:
+            float: 实际等待的秒数。
+        """
+        return self.bucket(urlsplit(url).hostname or '').acquire()
@@ -0,0 +1,355 @@
+# 导入必要的模块
+import os
+import json
+import time
+import datetime
+import importlib
+from threading import Thread, Event, RLock, current_thread
+
+from .logger import Logger
+from .taskpool import TaskPool
+
+# cron 表达式，格式同 crontab: 分 时 日 月 周
+class CronExpr:
+    """解析并匹配 5 段式 cron 表达式。"""
+
+    # 各字段的取值范围
+    FIELD_RANGES = [(0, 59), (0, 23), (1, 31), (1, 12), (0, 7)]
+
+    def __init__(self, expr:str):
+        """初始化 cron 表达式。
+
+        Args:
+            expr (str): cron 表达式，例如 '*/5 * * * *'，支持 *、a-b、a,b 与 /n 步长。
+        """
+        fields = expr.split()
+        if len(fields) != 5:
+            raise ValueError(f"cron 表达式必须包含 5 个字段: {expr}")
+        self.expr = expr
+        self.__fields = [self.__parse_field(field, low, high)
+                         for field, (low, high) in zip(fields, CronExpr.FIELD_RANGES)]
+        # 周字段中 7 与 0 都表示周日
+        if 7 in self.__fields[4]:
+            self.__fields[4].add(0)
+        # 日与周字段均有限定时按 crontab 规则取并集，以 * 开头（含 */n）的字段视为不限定
+        self.__dom_any = fields[2].startswith('*')
+        self.__dow_any = fields[4].startswith('*')
+
+    @staticmethod
+    def __parse_field(field, low, high):
+        """解析单个字段，返回允许的取值集合。"""
+        values = set()
+        for part in field.split(','):
+            step = 1
+            if '/' in part:
+                part, step_str = part.split('/', 1)
+                step = int(step_str)
+                if step < 1:
+                    raise ValueError(f"cron 步长必须 >= 1: {field}")
+            if part == '*':
+                start, end = low, high
+            elif '-' in part:
+                start_str, end_str = part.split('-', 1)
+                start, end = int(start_str), int(end_str)
+            else:
+                start = int(part)
+                end = high if step > 1 else start
+            if start < low or end > high or start > end:
+                raise ValueError(f"cron 字段超出范围 [{low}, {high}]: {field}")
+            values.update(range(start, end + 1, step))
+        return values
+
+    def match(self, dt:datetime.datetime):
+        """判断给定时间（精确到分钟）是否满足表达式。
+
+        Args:
+            dt (datetime.datetime): 待判断的时间。
+
+        Returns:
+            bool: 满足返回 True。
+        """
+        minutes, hours, doms, months, dows = self.__fields
+        if dt.minute not in minutes or dt.hour not in hours or dt.month not in months:
+            return False
+        # python 中周一为 0，cron 中周日为 0
+        dom_ok = dt.day in doms
+        dow_ok = (dt.weekday() + 1) % 7 in dows
+        if self.__dom_any or self.__dow_any:
+            return dom_ok and dow_ok
+        return dom_ok or dow_ok
+
+# 常驻调度器，按 interval 或 cron 周期在进程内执行任务
+class Scheduler(Thread):
+
+    # 内部类，用于表示一个定时任务
+    class Job:
+        """表示调度器中的一个定时任务及其运行统计。"""
+        def __init__(self, name, func, interval=None, cron=None, kwargs=None, priority=7, run_on_start=False):
+            """初始化定时任务。
+
+            Args:
+                name (str): 任务名称，配置中唯一。
+                func (str): 任务函数路径，格式为 'module:function'。
+                interval (float): 执行间隔（秒），与 cron 二选一。
+                cron (str): cron 表达式，与 interval 二选一。
+                kwargs (dict): 调用任务函数时传入的关键字参数。
+                priority (int): 提交到任务池时的优先级。
+                run_on_start (bool): interval 任务是否在加载后立即执行一次。
+            """
+            if (interval is None) == (cron is None):
+                raise ValueError(f"任务 {name} 必须且只能指定 interval 或 cron 之一")
+            if interval is not None and interval <= 0:
+                raise ValueError(f"任务 {name} 的 interval 必须 > 0")
+            self.name = name
+            self.func_path = func
+            self.func = Scheduler.Job.resolve(func)
+            self.interval = interval
+            self.cron = CronExpr(cron) if cron is not None else None
+            self.kwargs = kwargs or {}
+            self.priority = priority
+            self.next_run = time.time() if run_on_start else time.time() + (interval or 0)
+            self.last_minute = None
+            self.running = False
+            # 运行统计
+            self.runs = 0
+            self.failures = 0
+            self.skipped = 0
+            self.total_time = 0.0
+            self.last_time = None
+            self.max_time = 0.0
+            self.last_run = None
+            self.last_error = None
+
+        @staticmethod
+        def resolve(func_path):
+            """根据 'module:function' 路径导入任务函数，模块只导入一次。"""
+            module_name, _, attr = func_path.partition(':')
+            if not attr:
+                raise ValueError(f"任务函数路径格式应为 'module:function': {func_path}")
+            module = importlib.import_module(module_name)
+            return getattr(module, attr)
+
+        def is_due(self, now):
+            """判断任务当前是否应当执行。
+
+            Args:
+                now (float): 当前时间戳。
+
+            Returns:
+                bool: 需要执行返回 True。
+            """
+            if self.cron is not None:
+                dt = datetime.datetime.fromtimestamp(now)
+                minute = dt.strftime('%Y%m%d%H%M')
+                if minute == self.last_minute or not self.cron.match(dt):
+                    return False
+                self.last_minute = minute
+                return True
+            if now < self.next_run:
+                return False
+            self.next_run += self.interval
+            # 落后太多时不补跑，直接从当前时间重新计算
+            if self.next_run <= now:
+                self.next_run = now + self.interval
+            return True
+
+        def stats(self):
+            """返回任务的运行统计。"""
+            return {
+                'runs': self.runs,
+                'failures': self.failures,
+                'skipped': self.skipped,
+                'last_time': self.last_time,
+                'avg_time': self.total_time / self.runs if self.runs else None,
+                'max_time': self.max_time,
+                'last_run': self.last_run,
+                'last_error': self.last_error,
+            }
+
+    def __init__(self, config_file:str, pool_size:int=2, max_pool_size:int=3, tick:float=1,
+                 reload_interval:float=5, stats_interval:float=600, logfile:str='./logs/scheduler.log'):
+        """初始化调度器。
+
+        Args:
+            config_file (str): 任务配置文件路径（JSON），修改后自动热加载。
+            pool_size (int): 任务池初始线程数，默认值为 2。
+            max_pool_size (int): 任务池最大线程数，默认值为 3。
+            tick (float): 调度检查间隔（秒），默认值为 1。
+            reload_interval (float): 检查配置文件变化的间隔（秒），默认值为 5。
+            stats_interval (float): 输出运行统计的间隔（秒），默认值为 600，配置文件中可覆盖。
+            logfile (str): 日志文件路径，默认值为 './logs/scheduler.log'。
+        """
+        super().__init__()
+        self.name = 'scheduler'
+        self.__config_file = os.path.abspath(config_file)
+        self.__config_mtime = None
+        self.__tick = tick
+        self.__reload_interval = reload_interval
+        self.__stats_interval = stats_interval
+        self.__jobs = {}
+        self.__jobs_rlock = RLock()
+        self.__stop_event = Event()
+        self.__logger = Logger('scheduler', logfile)
+        self.__pool = TaskPool(pool_size, max_pool_size, logfile=os.path.join(os.path.dirname(logfile), 'taskpool.log'))
+        # 停止超时后任务池可能仍在运行，设为守护线程以免阻塞进程退出
+        self.__pool.daemon = True
+        self.reload()
+
+    def reload(self, force:bool=False):
+        """重新加载任务配置，文件未变化时跳过。
+
+        已存在的同名任务保留运行统计；配置有误时保留旧配置。
+
+        Args:
+            force (bool): 为 True 时忽略修改时间强制加载。
+
+        Returns:
+            bool: 发生重新加载返回 True。
+        """
+        try:
+            mtime = os.path.getmtime(self.__config_file)
+        except OSError as e:
+            self.__logger.error(f"无法读取任务配置 {self.__config_file}: {e}")
+            return False
+        if not force and mtime == self.__config_mtime:
+            return False
+        self.__config_mtime = mtime
+        try:
+            with open(self.__config_file, 'r', encoding='utf-8') as f:
+                config = json.load(f)
+            # 创建任务时会导入任务模块，可能较慢，放在锁外进行，避免阻塞调度与统计
+            jobs = {}
+            for item in config.get('jobs', []):
+                item = dict(item)
+                name = item.pop('name')
+                if name in jobs:
+                    raise ValueError(f"任务名称重复: {name}")
+                jobs[name] = Scheduler.Job(name, **item)
+            with self.__jobs_rlock:
+                for name, job in jobs.items():
+                    old = self.__jobs.get(name)
+                    if old is not None:
+                        # 沿用旧任务的统计与运行状态
+                        for attr in ('runs', 'failures', 'skipped', 'total_time', 'last_time',
+                                     'max_time', 'last_run', 'last_error', 'running', 'last_minute'):
+                            setattr(job, attr, getattr(old, attr))
+                        if old.interval == job.interval:
+                            job.next_run = old.next_run
+                self.__jobs = jobs
+            self.__stats_interval = config.get('stats_interval', self.__stats_interval)
+        except Exception as e:
+            self.__logger.error(f"加载任务配置失败，继续使用旧配置: {e}")
+            return False
+        self.__logger.info(f"已加载任务配置 {self.__config_file}: {list(jobs.keys())}")
+        return True
+
+    def __run_job(self, job):
+        """在任务池线程中执行任务并记录耗时。
+
+        Args:
+            job (Scheduler.Job): 要执行的任务。
+        """
+        start = time.perf_counter()
+        error = None
+        try:
+            job.func(**job.kwargs)
+        except Exception as e:
+            error = repr(e)
+            self.__logger.error(f"任务 {job.name} 执行出错: {e}")
+        elapsed = time.perf_counter() - start
+        with self.__jobs_rlock:
+            job.running = False
+            # 执行期间配置可能已热加载，统计记录到当前生效的同名任务上
+            job = self.__jobs.get(job.name, job)
+            job.runs += 1
+            job.total_time += elapsed
+            job.last_time = elapsed
+            job.max_time = max(job.max_time, elapsed)
+            job.last_run = time.time()
+            job.last_error = error
+            if error is not None:
+                job.failures += 1
+            job.running = False
+        self.__logger.info(f"任务 {job.name} 执行完成，耗时 {elapsed:.3f}s")
+
+    def __dispatch(self, job):
+        """将到期任务提交到任务池，上一次尚未结束时跳过。"""
+        with self.__jobs_rlock:
+            if job.running:
+                job.skipped += 1
+                self.__logger.warning(f"任务 {job.name} 上一次执行尚未结束，跳过本次")
+                return
+            job.running = True
+        if self.__pool.addTask(self.__run_job, job, job.priority) is None:
+            with self.__jobs_rlock:
+                job.running = False
+                job.skipped += 1
+
+    @property
+    def jobs(self):
+        """返回当前生效的任务，任务名称到 Scheduler.Job 的映射"""
+        with self.__jobs_rlock:
+            return dict(self.__jobs)
+
+    def stats(self):
+        """返回所有任务的运行统计。
+
+        Returns:
+            dict: 任务名称到统计信息的映射。
+        """
+        with self.__jobs_rlock:
+            return {name: job.stats() for name, job in self.__jobs.items()}
+
+    def report(self):
+        """将所有任务的运行统计写入日志。"""
+        for name, stat in self.stats().items():
+            avg = f"{stat['avg_time']:.3f}s" if stat['avg_time'] is not None else '-'
+            self.__logger.info(f"任务 {name} 统计: 执行 {stat['runs']} 次，失败 {stat['failures']} 次，"
+                               f"跳过 {stat['skipped']} 次，平均耗时 {avg}，最大耗时 {stat['max_time']:.3f}s")
+
+    def run(self):
+        """调度器的主运行循环。"""
+        self.__logger.info("调度器已启动")
+        self.__pool.start()
+        last_reload = last_report = time.time()
+        while not self.__stop_event.is_set():
+            now = time.time()
+            if now - last_reload >= self.__reload_interval:
+                last_reload = now
+                self.reload()
+            with self.__jobs_rlock:
+                due = [job for job in self.__jobs.values() if job.is_due(now)]
+            for job in due:
+                self.__dispatch(job)
+            if self.__stats_interval and now - last_report >= self.__stats_interval:
+                last_report = now
+                self.report()
+            self.__stop_event.wait(self.__tick)
+        self.__logger.info("调度器已结束")
+
+    def stop(self, timeout:float=60):
+        """停止调度器，等待正在执行的任务完成。
+
+        Args:
+            timeout (float): 等待正在执行的任务的最长时间（秒），默认值为 60。
+                超时后不再等待任务池，卡住的任务线程随进程退出。
+        """
+        self.__stop_event.set()
+        # 等待主循环退出，确保之后不会再有任务提交到任务池
+        if self.is_alive() and current_thread() is not self:
+            super().join()
+        # 任务池停止前需等待已提交的任务执行完毕
+        deadline = time.time() + timeout
+        while any(job.running for job in list(self.__jobs.values())):
+            if time.time() >= deadline:
+                running = [job.name for job in self.__jobs.values() if job.running]
+                self.__logger.warning(f"等待任务结束超时，放弃等待: {running}")
+                self.report()
+                return
+            time.sleep(0.1)
+        # 调度器未启动时任务池也未启动，无需停止
+        if self.__pool.is_alive():
+            self.__pool.stop()
+            self.__pool.join()
+        self.report()
+        self.__logger.info("调度器已停止")
@@ -92,7 +92,8 @@ class TaskPool(Thread):
         while not stop_event.is_set():
             try:
                 if task_queue.empty():
-                    time.sleep(1)
+                    # 等待期间收到停止通知立即退出
+                    stop_event.wait(1)
                     free_cnt += 1
                     # 空闲等待 x 次释放线程
                     if free_cnt > 60:
@@ -163,7 +164,7 @@ class TaskPool(Thread):
         while not self.__stop_event.is_set():
             try:
                 if self.__stop_queue.empty():
-                    time.sleep(1)
+                    self.__stop_event.wait(1)
                     continue
                 which = self.__stop_queue.get()
                 with self.__tasks_rlock:
@@ -181,9 +182,11 @@ class TaskPool(Thread):
     def stop(self):
         """停止任务池，等待所有任务完成。"""
         with self.__tasks_rlock:
+            # 先通知所有线程停止再逐个等待，线程并行退出
             for which, task_info in self.__tasks_dict.items():
                 if 'stop_event' in task_info:
                     task_info['stop_event'].set()
+            for which, task_info in self.__tasks_dict.items():
                 if 'thread' in task_info:
                     task_info['thread'].join()
                     self.__active_tasks -= 1
@@ -0,0 +1,86 @@
+# 导入必要的模块
+import os
+import json
+import time
+from threading import RLock
+
+# 带过期时间的令牌缓存，可持久化到磁盘
+class TokenCache:
+    """缓存 access_token 等有时效的令牌，临近过期时提前刷新。"""
+
+    def __init__(self, fetch, cache_file:str=None, refresh_margin:float=300, logger=None):
+        """初始化令牌缓存。
+
+        Args:
+            fetch (callable): 获取新令牌的函数，成功返回 (token, expires_in)，失败返回 None；
+                get() 的关键字参数会原样传给该函数。
+            cache_file (str): 持久化文件路径，为 None 时只缓存在内存中。
+            refresh_margin (float): 距离过期不足该秒数时提前刷新，默认值为 300。
+            logger: 日志记录器，为 None 时不记录日志。
+        """
+        self.__fetch = fetch
+        self.__cache_file = os.path.abspath(cache_file) if cache_file else None
+        self.__refresh_margin = refresh_margin
+        self.__logger = logger
+        self.__rlock = RLock()
+        self.__token = None
+        self.__expires_at = 0
+        self.__load()
+
+    def __log(self, msg):
+        if self.__logger is not None:
+            self.__logger.info(msg)
+
+    def __load(self):
+        """从磁盘读取缓存的令牌"""
+        if not self.__cache_file or not os.path.exists(self.__cache_file):
+            return
+        try:
+            with open(self.__cache_file, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            self.__token = data['token']
+            self.__expires_at = float(data['expires_at'])
+        except Exception as e:
+            self.__log(f"读取令牌缓存失败: {e}")
+
+    def __save(self):
+        """将令牌写入磁盘，先写临时文件再替换，文件权限仅限当前用户"""
+        if not self.__cache_file:
+            return
+        try:
+            os.makedirs(os.path.dirname(self.__cache_file), exist_ok=True)
+            tmp_file = f"{self.__cache_file}.tmp"
+            fd = os.open(tmp_file, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                json.dump({'token': self.__token, 'expires_at': self.__expires_at}, f)
+            os.replace(tmp_file, self.__cache_file)
+        except Exception as e:
+            self.__log(f"写入令牌缓存失败: {e}")
+
+    def get(self, force_refresh:bool=False, **fetch_kwargs):
+        """获取令牌，过期或临近过期时刷新。
+
+        刷新失败但旧令牌尚未过期时继续使用旧令牌；强制刷新失败时不回退，因为旧令牌已被判定无效。
+
+        Args:
+            force_refresh (bool): 为 True 时忽略缓存强制刷新。
+            **fetch_kwargs: 需要刷新时传给 fetch 的参数，例如本次使用的 HTTP 客户端。
+
+        Returns:
+            str or None: 令牌，获取失败返回 None。
+        """
+        with self.__rlock:
+            now = time.time()
+            if not force_refresh and self.__token and now < self.__expires_at - self.__refresh_margin:
+                return self.__token
+            result = self.__fetch(**fetch_kwargs)
+            if result is None:
+                if not force_refresh and self.__token and now < self.__expires_at:
+                    self.__log("刷新令牌失败，继续使用未过期的旧令牌")
+                    return self.__token
+                return None
+            token, expires_in = result
+            self.__token = token
+            self.__expires_at = now + float(expires_in)
+            self.__save()
+            return self.__token